@@ -1,13 +1,26 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from decimal import Decimal, getcontext, ROUND_HALF_UP
-from typing import Optional, Callable, Dict, List, Any
-import uuid
+from functools import lru_cache
+from types import MappingProxyType
+from array import array
+from typing import Optional, Callable, Dict, Iterable, Iterator, List, Mapping, Tuple, Any
+import bisect
+import json
+import sys
 import threading
 
+try:
+    import orjson
+except ImportError:  # optional; to_bytes falls back to the stdlib json module
+    orjson = None
+
 # Set Decimal precision
 getcontext().prec = 28
 
+# Set to True to assert internal money invariants while debugging
+_CHECK_INVARIANTS = False
+
 # Exceptions
 class AccountError(Exception):
     """Base class for account-related errors."""
@@ -21,15 +34,48 @@ class InsufficientSharesError(AccountError):
 class InvalidTransactionError(AccountError):
     """Raised when transaction inputs are invalid or unsupported symbols are used."""
 
-# Helper for currency quantization
-_CURRENCY_QUANT = Decimal("0.01")
+_ZERO = Decimal("0.00")
 
-def _quantize_currency(amount: Decimal) -> Decimal:
+# Internally all money is held as integer cents; Decimal only appears at the API boundary.
+# _to_cents is for values already validated as Decimal; untrusted input goes through
+# _to_cents_checked.
+def _to_cents(amount: Decimal) -> int:
+    return int((amount * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+def _to_cents_checked(amount: Decimal) -> int:
     if not isinstance(amount, Decimal):
         raise InvalidTransactionError("Amount must be a Decimal")
-    return amount.quantize(_CURRENCY_QUANT, rounding=ROUND_HALF_UP)
+    return _to_cents(amount)
+
+def _from_cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+# Serialized ledgers repeat the same amount/price strings many times; Decimal is
+# immutable, so parsed values can be shared
+@lru_cache(maxsize=4096)
+def _dec_str(value: str) -> Decimal:
+    return Decimal(value)
+
+def _dec(value: Any) -> Decimal:
+    # Only strings are cached: lru_cache keys on equality, which would merge e.g.
+    # Decimal("1.1") and Decimal("1.10") and lose the second one's precision
+    if type(value) is str:
+        return _dec_str(value)
+    return Decimal(value)
+
+# Traders repeat the same handful of symbols, so normalization results are memoized
+@lru_cache(maxsize=512)
+def _normalize_symbol(symbol: str) -> str:
+    return sys.intern(symbol.strip().upper())
+
+# Simple price oracle for tests; prices are already at currency scale
+_PRICE_TABLE: Mapping[str, Decimal] = MappingProxyType({
+    sys.intern(symbol): Decimal(price)
+    for symbol, price in (("AAPL", "150.00"), ("TSLA", "700.00"), ("GOOGL", "2700.00"))
+})
+
+_PRICES_CENTS: Mapping[str, int] = MappingProxyType({s: _to_cents(p) for s, p in _PRICE_TABLE.items()})
 
-# Simple price oracle for tests
 def get_share_price(symbol: str) -> Decimal:
     """Test implementation of a price oracle. Supported symbols:
 
@@ -41,17 +87,27 @@ def get_share_price(symbol: str) -> Decimal:
     """
     if not symbol or not isinstance(symbol, str):
         raise InvalidTransactionError("Invalid symbol")
-    s = symbol.strip().upper()
-    prices = {
-        "AAPL": Decimal("150.00"),
-        "TSLA": Decimal("700.00"),
-        "GOOGL": Decimal("2700.00"),
-    }
-    if s not in prices:
-        raise InvalidTransactionError(f"Price for symbol '{symbol}' is not available")
-    return _quantize_currency(prices[s])
-
-@dataclass
+    # Already-normalized symbols skip normalization entirely
+    price = _PRICE_TABLE.get(symbol)
+    if price is None:
+        price = _PRICE_TABLE.get(_normalize_symbol(symbol))
+        if price is None:
+            raise InvalidTransactionError(f"Price for symbol '{symbol}' is not available")
+    return price
+
+def _lookup_price_cents(symbol: str, price_fn: Callable[[str], Decimal]) -> int:
+    """Resolve the price of an already-normalized symbol as integer cents."""
+    if price_fn is get_share_price:
+        try:
+            return _PRICES_CENTS[symbol]
+        except KeyError:
+            raise InvalidTransactionError(f"Price for symbol '{symbol}' is not available") from None
+    price = price_fn(symbol)
+    if not isinstance(price, Decimal):
+        raise InvalidTransactionError("Price lookup must return a Decimal")
+    return _to_cents(price)
+
+@dataclass(slots=True)
 class Transaction:
     id: str
     type: str  # "deposit"/"withdraw"/"buy"/"sell"
@@ -63,10 +119,62 @@ class Transaction:
     timestamp: datetime
     note: Optional[str]
     resulting_cash_balance: Decimal
+    # None for newly recorded transactions; only Account.to_dict and serialize_ledger fill
+    # it in when serializing (see also Account.holdings_at)
     resulting_holdings_snapshot: Optional[Dict[str, int]] = field(default=None)
+    # Transactions are not mutated once recorded, so the serialized form is built once
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def _fast_new(
+        cls,
+        id: str,
+        type: str,
+        amount: Decimal,
+        symbol: Optional[str],
+        quantity: Optional[int],
+        price_per_share: Optional[Decimal],
+        total: Decimal,
+        timestamp: datetime,
+        note: Optional[str],
+        resulting_cash_balance: Decimal,
+    ) -> "Transaction":
+        """Positional constructor for trusted internal callers; skips the dataclass __init__."""
+        tx = object.__new__(cls)
+        tx.id = id
+        tx.type = type
+        tx.amount = amount
+        tx.symbol = symbol
+        tx.quantity = quantity
+        tx.price_per_share = price_per_share
+        tx.total = total
+        tx.timestamp = timestamp
+        tx.note = note
+        tx.resulting_cash_balance = resulting_cash_balance
+        tx.resulting_holdings_snapshot = None
+        tx._cached_dict = None
+        return tx
+
+    @property
+    def holdings_delta(self) -> Optional[Tuple[str, int]]:
+        """Signed share change applied by this transaction, or None for cash-only transactions."""
+        if self.symbol is None or self.quantity is None:
+            return None
+        if self.type == "buy":
+            return (self.symbol, self.quantity)
+        if self.type == "sell":
+            return (self.symbol, -self.quantity)
+        return None
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        """Serialize to plain types. The returned dict is cached and shared; do not mutate it.
+
+        resulting_holdings_snapshot is None unless the transaction was loaded with one; use
+        Account.to_dict or serialize_ledger for a ledger with holdings filled in.
+        """
+        if self._cached_dict is not None:
+            return self._cached_dict
+        self._cached_dict = {
             "id": self.id,
             "type": self.type,
             "amount": str(self.amount),
@@ -79,71 +187,174 @@ class Transaction:
             "resulting_cash_balance": str(self.resulting_cash_balance),
             "resulting_holdings_snapshot": dict(self.resulting_holdings_snapshot) if self.resulting_holdings_snapshot is not None else None,
         }
+        return self._cached_dict
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Transaction":
         ts = data.get("timestamp")
         timestamp = datetime.fromisoformat(ts) if isinstance(ts, str) else ts
-        price = Decimal(data["price_per_share"]) if data.get("price_per_share") is not None else None
-        return cls(
-            id=data["id"],
-            type=data["type"],
-            amount=Decimal(data["amount"]),
-            symbol=data.get("symbol"),
-            quantity=data.get("quantity"),
-            price_per_share=price,
-            total=Decimal(data["total"]),
-            timestamp=timestamp,
-            note=data.get("note"),
-            resulting_cash_balance=Decimal(data["resulting_cash_balance"]),
-            resulting_holdings_snapshot=data.get("resulting_holdings_snapshot"),
+        price = _dec(data["price_per_share"]) if data.get("price_per_share") is not None else None
+        tx = cls._fast_new(
+            data["id"],
+            data["type"],
+            _dec(data["amount"]),
+            data.get("symbol"),
+            data.get("quantity"),
+            price,
+            _dec(data["total"]),
+            timestamp,
+            data.get("note"),
+            _dec(data["resulting_cash_balance"]),
         )
+        tx.resulting_holdings_snapshot = data.get("resulting_holdings_snapshot")
+        return tx
+
+    def to_bytes(self) -> bytes:
+        """Compact UTF-8 JSON encoding of to_dict(); uses orjson when it is installed."""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), separators=(",", ":")).encode("utf-8")
+
+def _apply_holdings_delta(holdings: Dict[str, int], delta: Tuple[str, int]) -> None:
+    symbol, change = delta
+    remaining = holdings.get(symbol, 0) + change
+    if remaining:
+        holdings[symbol] = remaining
+    else:
+        holdings.pop(symbol, None)
+
+def _replay_holdings(running: Dict[str, int], tx: Transaction) -> None:
+    # A stored snapshot (e.g. loaded by from_dict) is authoritative; the ledger need not start
+    # from empty holdings, so later deltas are applied on top of it
+    if tx.resulting_holdings_snapshot is not None:
+        running.clear()
+        running.update(tx.resulting_holdings_snapshot)
+        return
+    delta = tx.holdings_delta
+    if delta is not None:
+        _apply_holdings_delta(running, delta)
+
+def serialize_ledger(ledger: Iterable[Transaction]) -> Iterator[Dict[str, Any]]:
+    """Serialize a full ledger in order, filling in each entry's resulting_holdings_snapshot.
+
+    Recorded transactions only carry their holdings delta, so snapshots are rebuilt by
+    replaying the ledger from the start; pass every transaction, not a filtered subset.
+    """
+    running: Dict[str, int] = {}
+    for tx in ledger:
+        _replay_holdings(running, tx)
+        if tx.resulting_holdings_snapshot is not None:
+            yield tx.to_dict()
+        else:
+            yield {**tx.to_dict(), "resulting_holdings_snapshot": dict(running) if running else None}
+
+def _tx_sequence(tx_id: str, user_id: str) -> int:
+    """Counter value encoded in an id produced by Account, or 0 for foreign ids (e.g. legacy uuids)."""
+    prefix, sep, seq = tx_id.rpartition(":")
+    if not sep or prefix != user_id:
+        return 0
+    try:
+        return int(seq, 16)
+    except ValueError:
+        return 0
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+class _NullLock:
+    """No-op stand-in for threading.Lock when an account is used from a single thread."""
+
+    def __enter__(self) -> "_NullLock":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
 
 class Account:
+    __slots__ = (
+        "user_id",
+        "currency",
+        "_cash_cents",
+        "_holdings",
+        "_portfolio_cents",
+        "_ledger",
+        "_ledger_by_id",
+        "_next_tx_id",
+        "_ledger_ts",
+        "_ledger_ts_sorted",
+        "_ledger_by_type",
+        "_initial_deposit_cents",
+        "_total_deposits_cents",
+        "_total_withdrawals_cents",
+        "_lock",
+        "_clock",
+    )
+
     def __init__(
         self,
         user_id: str,
-        initial_deposit: Decimal = Decimal("0.00"),
+        initial_deposit: Decimal = _ZERO,
         currency: str = "USD",
         timestamp: Optional[datetime] = None,
         lock: Optional[threading.Lock] = None,
+        single_threaded: bool = False,
+        clock: Optional[Callable[[], datetime]] = None,
     ) -> None:
         if not user_id or not isinstance(user_id, str):
             raise InvalidTransactionError("user_id must be a non-empty string")
         self.user_id = user_id
         self.currency = currency
-        self._cash = _quantize_currency(Decimal("0.00"))
+        # Monetary state is kept in integer cents
+        self._cash_cents = 0
         self._holdings: Dict[str, int] = {}
+        # Holdings valued at the default price table, kept up to date by buy/sell; None = recompute
+        self._portfolio_cents: Optional[int] = 0
         self._ledger: List[Transaction] = []
-        self._initial_deposit = _quantize_currency(initial_deposit) if initial_deposit is not None else Decimal("0.00")
-        self._total_deposits = Decimal("0.00")
-        self._total_withdrawals = Decimal("0.00")
-        self._lock = lock if lock is not None else threading.Lock()
+        self._ledger_by_id: Dict[str, Transaction] = {}
+        # Transaction ids only need to be unique within the account
+        self._next_tx_id = 0
+        # Parallel column of epoch seconds for range queries; valid for bisect while sorted.
+        # Packed arrays keep these index columns unboxed and contiguous.
+        self._ledger_ts = array("d")
+        self._ledger_ts_sorted = True
+        # Ledger positions per transaction type, in ascending order
+        self._ledger_by_type: Dict[str, array] = {}
+        self._initial_deposit_cents = _to_cents_checked(initial_deposit) if initial_deposit is not None else 0
+        self._total_deposits_cents = 0
+        self._total_withdrawals_cents = 0
+        if lock is not None:
+            self._lock = lock
+        elif single_threaded:
+            self._lock = _NullLock()
+        else:
+            self._lock = threading.Lock()
+        # Source of default timestamps; inject a fixed clock for deterministic tests
+        self._clock = clock if clock is not None else _utcnow
 
         if timestamp is None:
-            timestamp = datetime.now(timezone.utc)
-        if self._initial_deposit and self._initial_deposit > Decimal("0.00"):
+            timestamp = self._clock()
+        if self._initial_deposit_cents > 0:
             # Record initial deposit
-            self._cash = _quantize_currency(self._initial_deposit)
-            self._total_deposits = _quantize_currency(self._initial_deposit)
+            self._cash_cents = self._initial_deposit_cents
+            self._total_deposits_cents = self._initial_deposit_cents
             tx = self._record_transaction(
                 ttype="deposit",
-                amount=self._initial_deposit,
+                amount_cents=self._initial_deposit_cents,
                 timestamp=timestamp,
                 symbol=None,
                 quantity=None,
-                price_per_share=None,
+                price_cents=None,
                 note="initial_deposit",
             )
 
     # Private helpers
     def _now(self) -> datetime:
-        return datetime.now(timezone.utc)
+        return self._clock()
 
     def _validate_amount(self, amount: Decimal) -> None:
         if not isinstance(amount, Decimal):
             raise InvalidTransactionError("Amount must be a Decimal")
-        if amount <= Decimal("0.00"):
+        if amount <= _ZERO:
             raise InvalidTransactionError("Amount must be greater than zero")
 
     def _validate_quantity(self, quantity: int) -> None:
@@ -152,52 +363,104 @@ class Account:
         if quantity <= 0:
             raise InvalidTransactionError("Quantity must be greater than zero")
 
+    def _index_timestamp(self, timestamp: datetime) -> None:
+        if not self._ledger_ts_sorted:
+            return
+        if timestamp.tzinfo is None:
+            # naive timestamps have no fixed epoch; fall back to linear scans
+            self._ledger_ts_sorted = False
+            return
+        epoch = timestamp.timestamp()
+        if self._ledger_ts and epoch < self._ledger_ts[-1]:
+            self._ledger_ts_sorted = False
+            return
+        self._ledger_ts.append(epoch)
+
     def _record_transaction(
         self,
         ttype: str,
-        amount: Decimal,
+        amount_cents: int,
         timestamp: datetime,
         symbol: Optional[str],
         quantity: Optional[int],
-        price_per_share: Optional[Decimal],
+        price_cents: Optional[int],
         note: Optional[str],
     ) -> Transaction:
-        # Ensure currency quantization
-        amount_q = _quantize_currency(amount)
-        price_q = _quantize_currency(price_per_share) if price_per_share is not None else None
-        total = _quantize_currency(price_q * quantity) if (price_q is not None and quantity is not None) else amount_q
-        tx = Transaction(
-            id=uuid.uuid4().hex,
-            type=ttype,
-            amount=amount_q,
-            symbol=symbol,
-            quantity=quantity,
-            price_per_share=price_q,
-            total=total,
-            timestamp=timestamp,
-            note=note,
-            resulting_cash_balance=_quantize_currency(self._cash),
-            resulting_holdings_snapshot=dict(self._holdings) if self._holdings else None,
+        amount_q = _from_cents(amount_cents)
+        price_q = None
+        if price_cents is not None and quantity is not None:
+            if _CHECK_INVARIANTS:
+                assert amount_cents == price_cents * quantity, "trade amount must equal price * quantity"
+            price_q = _from_cents(price_cents)
+        # Trades record their total as the amount, so the same Decimal serves both
+        total = amount_q
+        self._next_tx_id += 1
+        tx = Transaction._fast_new(
+            f"{self.user_id}:{self._next_tx_id:x}",
+            ttype,
+            amount_q,
+            symbol,
+            quantity,
+            price_q,
+            total,
+            timestamp,
+            note,
+            _from_cents(self._cash_cents),
         )
-        self._ledger.append(tx)
+        self._append_tx(tx)
         return tx
 
+    def _append_tx(self, tx: Transaction) -> None:
+        # Caller must hold self._lock; keeps the ledger and all of its indexes in step
+        bucket = self._ledger_by_type.get(tx.type)
+        if bucket is None:
+            bucket = self._ledger_by_type[tx.type] = array("q")
+        bucket.append(len(self._ledger))
+        self._ledger.append(tx)
+        self._ledger_by_id[tx.id] = tx
+        self._index_timestamp(tx.timestamp)
+
+    def _adjust_portfolio_cents(self, symbol: str, change: int) -> None:
+        # Caller must hold self._lock
+        if self._portfolio_cents is None:
+            return
+        price_cents = _PRICES_CENTS.get(symbol)
+        if price_cents is None:
+            # No default price; the next valuation rewalks holdings (and reports the symbol)
+            self._portfolio_cents = None
+        else:
+            self._portfolio_cents += price_cents * change
+
+    def _portfolio_value_cents(self, price_fn: Callable[[str], Decimal]) -> int:
+        # Caller must hold self._lock
+        if price_fn is get_share_price:
+            if self._portfolio_cents is None:
+                prices = _PRICES_CENTS
+                try:
+                    self._portfolio_cents = sum(prices[symbol] * qty for symbol, qty in self._holdings.items())
+                except KeyError as e:
+                    raise InvalidTransactionError(f"Price for symbol '{e.args[0]}' is not available") from None
+            return self._portfolio_cents
+        lookup = _lookup_price_cents
+        return sum(lookup(symbol, price_fn) * qty for symbol, qty in self._holdings.items())
+
     # Public API
     def deposit(self, amount: Decimal, timestamp: Optional[datetime] = None, note: Optional[str] = None) -> Transaction:
         """Add cash to the account. Records a deposit transaction."""
         if timestamp is None:
             timestamp = self._now()
         self._validate_amount(amount)
+        amount_cents = _to_cents(amount)
         with self._lock:
-            self._cash = _quantize_currency(self._cash + amount)
-            self._total_deposits = _quantize_currency(self._total_deposits + amount)
+            self._cash_cents += amount_cents
+            self._total_deposits_cents += amount_cents
             return self._record_transaction(
                 ttype="deposit",
-                amount=amount,
+                amount_cents=amount_cents,
                 timestamp=timestamp,
                 symbol=None,
                 quantity=None,
-                price_per_share=None,
+                price_cents=None,
                 note=note,
             )
 
@@ -206,18 +469,19 @@ class Account:
         if timestamp is None:
             timestamp = self._now()
         self._validate_amount(amount)
+        amount_cents = _to_cents(amount)
         with self._lock:
-            if self._cash < amount:
+            if self._cash_cents < amount_cents:
                 raise InsufficientFundsError("Insufficient cash to withdraw the requested amount")
-            self._cash = _quantize_currency(self._cash - amount)
-            self._total_withdrawals = _quantize_currency(self._total_withdrawals + amount)
+            self._cash_cents -= amount_cents
+            self._total_withdrawals_cents += amount_cents
             return self._record_transaction(
                 ttype="withdraw",
-                amount=amount,
+                amount_cents=amount_cents,
                 timestamp=timestamp,
                 symbol=None,
                 quantity=None,
-                price_per_share=None,
+                price_cents=None,
                 note=note,
             )
 
@@ -238,25 +502,23 @@ class Account:
             raise InvalidTransactionError("Symbol must be a non-empty string")
         self._validate_quantity(quantity)
         price_fn = price_lookup if price_lookup is not None else get_share_price
-        symbol_norm = symbol.strip().upper()
-        price = price_fn(symbol_norm)
-        if not isinstance(price, Decimal):
-            raise InvalidTransactionError("Price lookup must return a Decimal")
-        price_q = _quantize_currency(price)
-        total_cost = _quantize_currency(price_q * quantity)
+        symbol_norm = _normalize_symbol(symbol)
+        price_cents = _lookup_price_cents(symbol_norm, price_fn)
+        total_cost_cents = price_cents * quantity
         with self._lock:
-            if self._cash < total_cost:
+            if self._cash_cents < total_cost_cents:
                 raise InsufficientFundsError("Insufficient cash to complete purchase")
             # Deduct cash and add holdings
-            self._cash = _quantize_currency(self._cash - total_cost)
+            self._cash_cents -= total_cost_cents
             self._holdings[symbol_norm] = self._holdings.get(symbol_norm, 0) + quantity
+            self._adjust_portfolio_cents(symbol_norm, quantity)
             return self._record_transaction(
                 ttype="buy",
-                amount=total_cost,
+                amount_cents=total_cost_cents,
                 timestamp=timestamp,
                 symbol=symbol_norm,
                 quantity=quantity,
-                price_per_share=price_q,
+                price_cents=price_cents,
                 note=note,
             )
 
@@ -274,17 +536,14 @@ class Account:
         if not symbol or not isinstance(symbol, str):
             raise InvalidTransactionError("Symbol must be a non-empty string")
         self._validate_quantity(quantity)
-        symbol_norm = symbol.strip().upper()
+        symbol_norm = _normalize_symbol(symbol)
         with self._lock:
             held = self._holdings.get(symbol_norm, 0)
             if held < quantity:
                 raise InsufficientSharesError(f"Attempting to sell {quantity} shares but only {held} held for {symbol_norm}")
             price_fn = price_lookup if price_lookup is not None else get_share_price
-            price = price_fn(symbol_norm)
-            if not isinstance(price, Decimal):
-                raise InvalidTransactionError("Price lookup must return a Decimal")
-            price_q = _quantize_currency(price)
-            total_proceeds = _quantize_currency(price_q * quantity)
+            price_cents = _lookup_price_cents(symbol_norm, price_fn)
+            total_proceeds_cents = price_cents * quantity
             # Update holdings and cash
             remaining = held - quantity
             if remaining:
@@ -292,50 +551,83 @@ class Account:
             else:
                 # remove zero holdings
                 self._holdings.pop(symbol_norm, None)
-            self._cash = _quantize_currency(self._cash + total_proceeds)
+            self._adjust_portfolio_cents(symbol_norm, -quantity)
+            self._cash_cents += total_proceeds_cents
             return self._record_transaction(
                 ttype="sell",
-                amount=total_proceeds,
+                amount_cents=total_proceeds_cents,
                 timestamp=timestamp,
                 symbol=symbol_norm,
                 quantity=quantity,
-                price_per_share=price_q,
+                price_cents=price_cents,
                 note=note,
             )
 
     def get_holdings(self) -> Dict[str, int]:
         with self._lock:
-            return dict(self._holdings)
+            return self._holdings.copy()
+
+    def get_holdings_view(self) -> Mapping[str, int]:
+        """Read-only live view of holdings, without copying.
+
+        The view reflects later trades, so only use it for reads that finish before the
+        account is mutated again; use get_holdings() when a stable copy is needed.
+        """
+        return MappingProxyType(self._holdings)
 
     def get_cash_balance(self) -> Decimal:
         with self._lock:
-            return _quantize_currency(self._cash)
+            cash_cents = self._cash_cents
+        return _from_cents(cash_cents)
 
     def get_portfolio_value(self, price_lookup: Optional[Callable[[str], Decimal]] = None) -> Decimal:
         price_fn = price_lookup if price_lookup is not None else get_share_price
-        total = Decimal("0.00")
         with self._lock:
-            for symbol, qty in self._holdings.items():
-                price = price_fn(symbol)
-                if not isinstance(price, Decimal):
-                    raise InvalidTransactionError("Price lookup must return a Decimal")
-                price_q = _quantize_currency(price)
-                total += _quantize_currency(price_q * qty)
-        return _quantize_currency(total)
+            total_cents = self._portfolio_value_cents(price_fn)
+        return _from_cents(total_cents)
 
     def get_total_equity(self, price_lookup: Optional[Callable[[str], Decimal]] = None) -> Decimal:
-        cash = self.get_cash_balance()
-        portfolio = self.get_portfolio_value(price_lookup=price_lookup)
-        return _quantize_currency(cash + portfolio)
+        price_fn = price_lookup if price_lookup is not None else get_share_price
+        with self._lock:
+            equity_cents = self._cash_cents + self._portfolio_value_cents(price_fn)
+        return _from_cents(equity_cents)
 
     def get_profit_loss_from_initial(self, price_lookup: Optional[Callable[[str], Decimal]] = None) -> Decimal:
-        equity = self.get_total_equity(price_lookup=price_lookup)
-        return _quantize_currency(equity - _quantize_currency(self._initial_deposit))
+        price_fn = price_lookup if price_lookup is not None else get_share_price
+        with self._lock:
+            equity_cents = self._cash_cents + self._portfolio_value_cents(price_fn)
+        return _from_cents(equity_cents - self._initial_deposit_cents)
 
     def get_profit_loss_from_net_deposits(self, price_lookup: Optional[Callable[[str], Decimal]] = None) -> Decimal:
-        equity = self.get_total_equity(price_lookup=price_lookup)
-        net_deposited = _quantize_currency(self._total_deposits - self._total_withdrawals)
-        return _quantize_currency(equity - net_deposited)
+        price_fn = price_lookup if price_lookup is not None else get_share_price
+        with self._lock:
+            equity_cents = self._cash_cents + self._portfolio_value_cents(price_fn)
+            net_deposited_cents = self._total_deposits_cents - self._total_withdrawals_cents
+        return _from_cents(equity_cents - net_deposited_cents)
+
+    def snapshot(self, price_lookup: Optional[Callable[[str], Decimal]] = None) -> Dict[str, Any]:
+        """Read cash, holdings, valuations, P&L and the ledger in a single critical section.
+
+        Equivalent to calling the individual getters, but the portfolio is valued once and
+        all figures are consistent with each other.
+        """
+        price_fn = price_lookup if price_lookup is not None else get_share_price
+        with self._lock:
+            cash_cents = self._cash_cents
+            holdings = self._holdings.copy()
+            portfolio_cents = self._portfolio_value_cents(price_fn)
+            net_deposited_cents = self._total_deposits_cents - self._total_withdrawals_cents
+            transactions = list(self._ledger)
+        equity_cents = cash_cents + portfolio_cents
+        return {
+            "cash": _from_cents(cash_cents),
+            "holdings": holdings,
+            "portfolio_value": _from_cents(portfolio_cents),
+            "total_equity": _from_cents(equity_cents),
+            "pnl_initial": _from_cents(equity_cents - self._initial_deposit_cents),
+            "pnl_net": _from_cents(equity_cents - net_deposited_cents),
+            "transactions": transactions,
+        }
 
     def list_transactions(
         self,
@@ -344,6 +636,25 @@ class Account:
         types: Optional[List[str]] = None,
     ) -> List[Transaction]:
         with self._lock:
+            if (
+                self._ledger_ts_sorted
+                and (start_time is None or start_time.tzinfo is not None)
+                and (end_time is None or end_time.tzinfo is not None)
+            ):
+                lo = bisect.bisect_left(self._ledger_ts, start_time.timestamp()) if start_time is not None else 0
+                hi = bisect.bisect_right(self._ledger_ts, end_time.timestamp()) if end_time is not None else len(self._ledger)
+                if types is None:
+                    return self._ledger[lo:hi]
+                # Intersect the per-type position lists with [lo, hi)
+                positions: List[int] = []
+                buckets = 0
+                for ttype, bucket in self._ledger_by_type.items():
+                    if ttype in types:
+                        positions.extend(bucket[bisect.bisect_left(bucket, lo):bisect.bisect_left(bucket, hi)])
+                        buckets += 1
+                if buckets > 1:
+                    positions.sort()
+                return [self._ledger[i] for i in positions]
             result: List[Transaction] = []
             for tx in self._ledger:
                 if start_time is not None and tx.timestamp < start_time:
@@ -355,39 +666,83 @@ class Account:
                 result.append(tx)
             return list(result)
 
+    def holdings_at(self, tx_index: int) -> Dict[str, int]:
+        """Reconstruct holdings as they stood right after the ledger entry at `tx_index`.
+
+        Holdings are not snapshotted per transaction; they are replayed from each
+        transaction's holdings_delta, starting from the latest snapshot loaded by from_dict.
+        """
+        with self._lock:
+            n = len(self._ledger)
+            if tx_index < 0:
+                tx_index += n
+            if not 0 <= tx_index < n:
+                raise InvalidTransactionError(f"Transaction index {tx_index} is out of range")
+            ledger = self._ledger[:tx_index + 1]
+        holdings: Dict[str, int] = {}
+        for tx in ledger:
+            _replay_holdings(holdings, tx)
+        return holdings
+
     def get_transaction(self, transaction_id: str) -> Transaction:
         with self._lock:
-            for tx in self._ledger:
-                if tx.id == transaction_id:
-                    return tx
+            tx = self._ledger_by_id.get(transaction_id)
+        if tx is not None:
+            return tx
         raise InvalidTransactionError(f"Transaction with id {transaction_id} not found")
 
     def to_dict(self) -> Dict[str, Any]:
+        # Snapshot under the lock, serialize outside it
+        with self._lock:
+            cash_cents = self._cash_cents
+            holdings = self._holdings.copy()
+            initial_deposit_cents = self._initial_deposit_cents
+            total_deposits_cents = self._total_deposits_cents
+            total_withdrawals_cents = self._total_withdrawals_cents
+            ledger = list(self._ledger)
+        return {
+            "user_id": self.user_id,
+            "currency": self.currency,
+            "cash": str(_from_cents(cash_cents)),
+            "holdings": holdings,
+            "initial_deposit": str(_from_cents(initial_deposit_cents)),
+            "total_deposits": str(_from_cents(total_deposits_cents)),
+            "total_withdrawals": str(_from_cents(total_withdrawals_cents)),
+            "ledger": list(serialize_ledger(ledger)),
+        }
+
+    def iter_ledger_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Yield the serialized ledger one transaction at a time.
+
+        Produces the same entries as to_dict()["ledger"] without materializing the whole
+        list, e.g. for streaming to a file:
+        "[" + ",".join(json.dumps(d) for d in acct.iter_ledger_dicts()) + "]".
+        """
         with self._lock:
-            return {
-                "user_id": self.user_id,
-                "currency": self.currency,
-                "cash": str(self._cash),
-                "holdings": dict(self._holdings),
-                "initial_deposit": str(self._initial_deposit),
-                "total_deposits": str(self._total_deposits),
-                "total_withdrawals": str(self._total_withdrawals),
-                "ledger": [tx.to_dict() for tx in self._ledger],
-            }
+            ledger = list(self._ledger)
+        yield from serialize_ledger(ledger)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Account":
         user_id = data["user_id"]
-        initial_deposit = Decimal(data.get("initial_deposit", "0.00"))
+        initial_deposit = _dec(data.get("initial_deposit", "0.00"))
         currency = data.get("currency", "USD")
-        acct = cls(user_id=user_id, initial_deposit=Decimal("0.00"), currency=currency)
+        acct = cls(user_id=user_id, initial_deposit=_ZERO, currency=currency)
         # Overwrite internals according to provided data
         with acct._lock:
-            acct._cash = _quantize_currency(Decimal(data.get("cash", "0.00")))
-            acct._holdings = dict(data.get("holdings", {}))
-            acct._initial_deposit = _quantize_currency(initial_deposit)
-            acct._total_deposits = _quantize_currency(Decimal(data.get("total_deposits", "0.00")))
-            acct._total_withdrawals = _quantize_currency(Decimal(data.get("total_withdrawals", "0.00")))
-            # Rebuild ledger
-            acct._ledger = [Transaction.from_dict(d) for d in data.get("ledger", [])]
+            acct._cash_cents = _to_cents(_dec(data.get("cash", "0.00")))
+            # Trades key holdings by normalized symbol; accept hand-written data that does not
+            holdings: Dict[str, int] = {}
+            for symbol, qty in data.get("holdings", {}).items():
+                symbol = _normalize_symbol(symbol)
+                holdings[symbol] = holdings.get(symbol, 0) + qty
+            acct._holdings = holdings
+            acct._portfolio_cents = None
+            acct._initial_deposit_cents = _to_cents(initial_deposit)
+            acct._total_deposits_cents = _to_cents(_dec(data.get("total_deposits", "0.00")))
+            acct._total_withdrawals_cents = _to_cents(_dec(data.get("total_withdrawals", "0.00")))
+            # Rebuild ledger (the account was created without an initial deposit, so it is empty)
+            for d in data.get("ledger", []):
+                acct._append_tx(Transaction.from_dict(d))
+            acct._next_tx_id = max((_tx_sequence(tx.id, user_id) for tx in acct._ledger), default=0)
         return acct
\ No newline at end of file
@@ -3,7 +3,7 @@ import gradio as gr
 from decimal import Decimal, InvalidOperation
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
-from accounts import Account, get_share_price, AccountError
+from accounts import Account, get_share_price, serialize_ledger, AccountError
 
 
 # Helper formatters
@@ -11,28 +11,28 @@ def _fmt_money(amount: Decimal, currency: str = "USD") -> str:
     return f"{amount:.2f} {currency}"
 
 
-def _empty_snapshot() -> Tuple[
-    str, str, Dict[str, int], str, str, List[Dict[str, Any]]
-]:
-    return (
-        "No account exists. Create an account to begin.",
-        "0.00 USD",
-        {},
-        "0.00 USD",
-        "0.00 USD",
-        [],
-    )
+# Shared, never mutated: returned on every path that has no account to show
+_EMPTY_SNAPSHOT: Tuple[str, str, Dict[str, int], str, str, List[Dict[str, Any]]] = (
+    "No account exists. Create an account to begin.",
+    "0.00 USD",
+    {},
+    "0.00 USD",
+    "0.00 USD",
+    [],
+)
+
+_ZERO = Decimal("0.00")
 
 
 def snapshot_for_account(
     acct: Account,
 ) -> Tuple[str, str, Dict[str, int], str, str, List[Dict[str, Any]]]:
-    cash = acct.get_cash_balance()
-    holdings = acct.get_holdings()
-    portfolio = acct.get_portfolio_value()
-    total_equity = acct.get_total_equity()
-    profit_initial = acct.get_profit_loss_from_initial()
-    txs = [tx.to_dict() for tx in acct.list_transactions()]
+    snap = acct.snapshot()
+    cash = snap["cash"]
+    holdings = snap["holdings"]
+    total_equity = snap["total_equity"]
+    profit_initial = snap["pnl_initial"]
+    txs = list(serialize_ledger(snap["transactions"]))
     status = f"Account '{acct.user_id}' loaded. Cash: {_fmt_money(cash, acct.currency)}"
     return (
         status,
@@ -51,7 +51,7 @@ def create_account(
     if not user_id or not isinstance(user_id, str) or user_id.strip() == "":
         return (
             ("Error: user_id must be a non-empty string.",)
-            + _empty_snapshot()
+            + _EMPTY_SNAPSHOT
             + (state,)
         )
 
@@ -59,16 +59,18 @@ def create_account(
         deposit_val = (
             Decimal(initial_deposit)
             if initial_deposit not in (None, "")
-            else Decimal("0.00")
+            else _ZERO
         )
     except (InvalidOperation, TypeError):
         return (
             ("Error: initial deposit must be a valid number (e.g., 1000.00).",)
-            + _empty_snapshot()
+            + _EMPTY_SNAPSHOT
             + (state,)
         )
 
     try:
+        # Gradio runs sync handlers in a thread pool, so events for the same session can
+        # overlap; keep the default lock
         acct = Account(user_id=user_id.strip(), initial_deposit=deposit_val)
         status, cash, holdings, portfolio, profit, txs = snapshot_for_account(acct)
         return (
@@ -81,11 +83,11 @@ def create_account(
             acct,
         )
     except AccountError as e:
-        return (f"Error creating account: {str(e)}",) + _empty_snapshot() + (state,)
+        return (f"Error creating account: {str(e)}",) + _EMPTY_SNAPSHOT + (state,)
     except Exception as e:
         return (
             (f"Unexpected error creating account: {str(e)}",)
-            + _empty_snapshot()
+            + _EMPTY_SNAPSHOT
             + (state,)
         )
 
@@ -96,7 +98,7 @@ def deposit(
     if state is None:
         return (
             ("No account found. Create an account first.",)
-            + _empty_snapshot()
+            + _EMPTY_SNAPSHOT
             + (state,)
         )
     try:
@@ -135,7 +137,7 @@ def withdraw(
     if state is None:
         return (
             ("No account found. Create an account first.",)
-            + _empty_snapshot()
+            + _EMPTY_SNAPSHOT
             + (state,)
         )
     try:
@@ -174,7 +176,7 @@ def buy(
     if state is None:
         return (
             ("No account found. Create an account first.",)
-            + _empty_snapshot()
+            + _EMPTY_SNAPSHOT
             + (state,)
         )
     if not symbol or symbol.strip() == "":
@@ -215,7 +217,7 @@ def sell(
     if state is None:
         return (
             ("No account found. Create an account first.",)
-            + _empty_snapshot()
+            + _EMPTY_SNAPSHOT
             + (state,)
         )
     if not symbol or symbol.strip() == "":
@@ -255,13 +257,13 @@ def refresh(
 ) -> Tuple[str, str, Dict[str, int], str, str, List[Dict[str, Any]], Optional[Account]]:
     if state is None:
         return (
-            ("No account exists. Create one to begin.",) + _empty_snapshot() + (state,)
+            ("No account exists. Create one to begin.",) + _EMPTY_SNAPSHOT + (state,)
         )
     try:
         status, cash, holdings, portfolio, profit, txs = snapshot_for_account(state)
         return (status, cash, holdings, portfolio, profit, txs, state)
     except Exception as e:
-        return (f"Error refreshing snapshot: {str(e)}",) + _empty_snapshot() + (state,)
+        return (f"Error refreshing snapshot: {str(e)}",) + _EMPTY_SNAPSHOT + (state,)
 
 
 # Build Gradio UI
@@ -410,7 +412,7 @@ with gr.Blocks() as demo:
 
     # Initialize UI with empty snapshot
     init_status, init_cash, init_holdings, init_portfolio, init_profit, init_txs = (
-        _empty_snapshot()
+        _EMPTY_SNAPSHOT
     )
     status_out.value = init_status
     cash_out.value = init_cash
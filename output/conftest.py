@@ -0,0 +1,24 @@
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import accounts
+
+
+FROZEN = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def frozen_clock():
+    return lambda: FROZEN
+
+
+@pytest.fixture
+def empty_account(frozen_clock):
+    return accounts.Account(user_id="u", clock=frozen_clock)
+
+
+@pytest.fixture
+def funded_account(empty_account):
+    empty_account.deposit(Decimal("10000.00"))
+    return empty_account
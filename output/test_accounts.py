@@ -1,3 +1,5 @@
+import dataclasses
+import json
 import pytest
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
@@ -32,6 +34,22 @@ def test_deposit_and_withdraw():
     assert acct.get_cash_balance() == Decimal("70.00")
     assert tx2.type == "withdraw"
 
+def test_amounts_rounded_half_up_to_cents():
+    acct = accounts.Account(user_id="cents")
+    tx = acct.deposit(Decimal("100.005"))
+    assert tx.amount == Decimal("100.01")
+    assert str(acct.get_cash_balance()) == "100.01"
+    price = lambda symbol: Decimal("33.333")
+    buy_tx = acct.buy(AAPL, 3, price_lookup=price)
+    assert buy_tx.price_per_share == Decimal("33.33")
+    assert buy_tx.total == Decimal("99.99")
+
+def test_default_timestamps_come_from_clock(frozen_clock):
+    acct = accounts.Account(user_id="clocked", initial_deposit=Decimal("10.00"), clock=frozen_clock)
+    tx = acct.deposit(Decimal("5.00"))
+    assert tx.timestamp == frozen_clock()
+    assert acct.list_transactions()[0].timestamp == frozen_clock()
+
 def test_initial_deposit_recorded():
     ts = datetime(2021,5,1, tzinfo=timezone.utc)
     acct = accounts.Account(user_id="user_init", initial_deposit=Decimal("250.00"), timestamp=ts)
@@ -48,23 +66,27 @@ def test_withdraw_insufficient_funds():
     with pytest.raises(accounts.InsufficientFundsError):
         acct.withdraw(Decimal("20.00"))
 
-def test_deposit_invalid_amount_type():
-    acct = accounts.Account(user_id="user3")
+def test_deposit_invalid_amount_type(empty_account):
     with pytest.raises(accounts.InvalidTransactionError):
-        acct.deposit(100.0)  # not a Decimal
-
-def test_buy_with_sufficient_cash():
-    acct = accounts.Account(user_id="buyer")
-    acct.deposit(Decimal("1000.00"))
-    tx = acct.buy(AAPL, 2)
-    # 2 * 150 = 300.00
-    assert acct.get_cash_balance() == Decimal("700.00")
-    holdings = acct.get_holdings()
-    assert holdings.get("AAPL") == 2
+        empty_account.deposit(100.0)  # not a Decimal
+
+@pytest.mark.parametrize(
+    "symbol, quantity, cost",
+    [
+        (AAPL, 2, Decimal("300.00")),
+        (TSLA, 1, Decimal("700.00")),
+        (GOOGL, 1, Decimal("2700.00")),
+    ],
+)
+def test_buy_with_sufficient_cash(funded_account, symbol, quantity, cost):
+    tx = funded_account.buy(symbol, quantity)
+    assert funded_account.get_cash_balance() == Decimal("10000.00") - cost
+    holdings = funded_account.get_holdings()
+    assert holdings.get(symbol) == quantity
     assert tx.type == "buy"
-    assert tx.symbol == "AAPL"
-    assert tx.quantity == 2
-    assert tx.price_per_share == Decimal("150.00")
+    assert tx.symbol == symbol
+    assert tx.quantity == quantity
+    assert tx.price_per_share * quantity == cost
 
 def test_buy_insufficient_funds():
     acct = accounts.Account(user_id="buyer2")
@@ -72,22 +94,35 @@ def test_buy_insufficient_funds():
     with pytest.raises(accounts.InsufficientFundsError):
         acct.buy(TSLA, 1)  # TSLA is 700.00
 
-def test_sell_with_sufficient_shares():
-    acct = accounts.Account(user_id="seller")
-    acct.deposit(Decimal("2000.00"))
-    acct.buy(TSLA, 1)  # cost 700
-    before_cash = acct.get_cash_balance()
-    tx = acct.sell(TSLA, 1)
+@pytest.mark.parametrize(
+    "symbol, proceeds",
+    [
+        (AAPL, Decimal("150.00")),
+        (TSLA, Decimal("700.00")),
+        (GOOGL, Decimal("2700.00")),
+    ],
+)
+def test_sell_with_sufficient_shares(funded_account, symbol, proceeds):
+    funded_account.buy(symbol, 1)
+    before_cash = funded_account.get_cash_balance()
+    tx = funded_account.sell(symbol, 1)
     # cash should increase back
-    assert acct.get_cash_balance() == before_cash + Decimal("700.00")
-    assert acct.get_holdings().get("TSLA") is None
+    assert funded_account.get_cash_balance() == before_cash + proceeds
+    assert funded_account.get_holdings().get(symbol) is None
     assert tx.type == "sell"
-    assert tx.symbol == "TSLA"
+    assert tx.symbol == symbol
 
-def test_sell_insufficient_shares():
-    acct = accounts.Account(user_id="seller2")
+def test_holdings_view_is_read_only_and_live():
+    acct = accounts.Account(user_id="viewer", initial_deposit=Decimal("1000.00"))
+    view = acct.get_holdings_view()
+    acct.buy(AAPL, 1)
+    assert view == {"AAPL": 1}
+    with pytest.raises(TypeError):
+        view["AAPL"] = 5
+
+def test_sell_insufficient_shares(empty_account):
     with pytest.raises(accounts.InsufficientSharesError):
-        acct.sell(AAPL, 1)
+        empty_account.sell(AAPL, 1)
 
 def test_transaction_serialization_roundtrip():
     acct = accounts.Account(user_id="ser")
@@ -100,6 +135,23 @@ def test_transaction_serialization_roundtrip():
     assert tx.timestamp == tx2.timestamp
     assert tx.note == tx2.note
 
+def test_transaction_from_dict_keeps_decimal_precision():
+    base = {"id": "p", "type": "deposit", "amount": Decimal("5.0"), "total": Decimal("5.0"),
+            "timestamp": "2020-01-01T00:00:00+00:00", "resulting_cash_balance": Decimal("5.0")}
+    assert accounts.Transaction.from_dict(base).to_dict()["total"] == "5.0"
+    precise = {**base, "total": Decimal("5.00")}
+    assert accounts.Transaction.from_dict(precise).to_dict()["total"] == "5.00"
+
+def test_transaction_to_bytes_is_json():
+    acct = accounts.Account(user_id="bytes")
+    tx = acct.deposit(Decimal("12.34"), timestamp=datetime(2022,3,3, tzinfo=timezone.utc))
+    assert json.loads(tx.to_bytes()) == tx.to_dict()
+
+def test_replaced_transaction_does_not_reuse_cached_dict(funded_account):
+    tx = funded_account.buy(AAPL, 2)
+    assert tx.to_dict()["quantity"] == 2
+    assert dataclasses.replace(tx, quantity=5).to_dict()["quantity"] == 5
+
 def test_account_to_from_dict_roundtrip():
     acct = accounts.Account(user_id="round", initial_deposit=Decimal("100.00"))
     acct.deposit(Decimal("50.00"))
@@ -112,6 +164,61 @@ def test_account_to_from_dict_roundtrip():
     # ledger lengths should match
     assert len(acct2.list_transactions()) == len(acct.list_transactions())
 
+def test_from_dict_normalizes_holdings_symbols():
+    acct = accounts.Account.from_dict({"user_id": "legacy", "cash": "0.00", "holdings": {"aapl": 1, " tsla ": 2}})
+    assert acct.get_holdings() == {"AAPL": 1, "TSLA": 2}
+    assert acct.get_portfolio_value() == Decimal("1550.00")
+
+def test_holdings_at_replays_deltas():
+    acct = accounts.Account(user_id="history", initial_deposit=Decimal("5000.00"))
+    buy_tx = acct.buy(AAPL, 3)
+    acct.deposit(Decimal("10.00"))
+    sell_tx = acct.sell(AAPL, 1)
+    assert buy_tx.holdings_delta == ("AAPL", 3)
+    assert sell_tx.holdings_delta == ("AAPL", -1)
+    assert acct.holdings_at(0) == {}
+    assert acct.holdings_at(2) == {"AAPL": 3}
+    assert acct.holdings_at(-1) == acct.get_holdings() == {"AAPL": 2}
+    snapshots = [d["resulting_holdings_snapshot"] for d in acct.to_dict()["ledger"]]
+    assert snapshots == [None, {"AAPL": 3}, {"AAPL": 3}, {"AAPL": 2}]
+    with pytest.raises(accounts.InvalidTransactionError):
+        acct.holdings_at(4)
+
+def test_round_trip_keeps_history_not_starting_from_zero():
+    data = {
+        "user_id": "legacy",
+        "cash": "150.00",
+        "holdings": {"AAPL": 4},
+        "ledger": [{
+            "id": "legacy-sell", "type": "sell", "amount": "150.00", "symbol": "AAPL",
+            "quantity": 1, "price_per_share": "150.00", "total": "150.00",
+            "timestamp": "2020-01-01T00:00:00+00:00", "note": None,
+            "resulting_cash_balance": "150.00", "resulting_holdings_snapshot": {"AAPL": 4},
+        }],
+    }
+    acct = accounts.Account.from_dict(data)
+    acct.buy(AAPL, 1)
+    ledger = accounts.Account.from_dict(acct.to_dict()).to_dict()["ledger"]
+    assert [d["resulting_holdings_snapshot"] for d in ledger] == [{"AAPL": 4}, {"AAPL": 5}]
+    assert acct.holdings_at(0) == {"AAPL": 4}
+    assert acct.holdings_at(1) == acct.get_holdings() == {"AAPL": 5}
+
+def test_transaction_ids_continue_after_from_dict():
+    acct = accounts.Account(user_id="ids", initial_deposit=Decimal("100.00"))
+    acct.deposit(Decimal("5.00"))
+    acct2 = accounts.Account.from_dict(acct.to_dict())
+    tx = acct2.deposit(Decimal("1.00"))
+    ids = [t.id for t in acct2.list_transactions()]
+    assert len(set(ids)) == len(ids) == 3
+    assert acct2.get_transaction(tx.id) is tx
+
+def test_iter_ledger_dicts_matches_to_dict():
+    acct = accounts.Account(user_id="stream", initial_deposit=Decimal("1000.00"))
+    acct.buy(AAPL, 2)
+    acct.withdraw(Decimal("50.00"))
+    assert list(acct.iter_ledger_dicts()) == acct.to_dict()["ledger"]
+    assert list(accounts.serialize_ledger(acct.snapshot()["transactions"])) == acct.to_dict()["ledger"]
+
 def test_list_transactions_filtering():
     acct = accounts.Account(user_id="filter")
     t1 = datetime(2020,1,1, tzinfo=timezone.utc)
@@ -129,6 +236,36 @@ def test_list_transactions_filtering():
     deposits = acct.list_transactions(types=["deposit"])
     assert all(tx.type == "deposit" for tx in deposits)
 
+def test_list_transactions_types_within_range():
+    acct = accounts.Account(user_id="typed")
+    base = datetime(2021,1,1, tzinfo=timezone.utc)
+    acct.deposit(Decimal("5000.00"), timestamp=base)
+    buy1 = acct.buy(AAPL, 1, timestamp=base + timedelta(days=1))
+    dep = acct.deposit(Decimal("10.00"), timestamp=base + timedelta(days=2))
+    sell = acct.sell(AAPL, 1, timestamp=base + timedelta(days=3))
+    acct.buy(TSLA, 1, timestamp=base + timedelta(days=4))
+    res = acct.list_transactions(
+        start_time=base + timedelta(days=1),
+        end_time=base + timedelta(days=3),
+        types=["sell", "buy"],
+    )
+    assert res == [buy1, sell]
+    assert acct.list_transactions(start_time=base + timedelta(days=2), types=["deposit"]) == [dep]
+    assert acct.list_transactions(types=["withdraw"]) == []
+
+def test_list_transactions_out_of_order_timestamps():
+    acct = accounts.Account(user_id="unordered")
+    t1 = datetime(2020,1,1, tzinfo=timezone.utc)
+    t2 = datetime(2020,6,1, tzinfo=timezone.utc)
+    t3 = datetime(2020,12,1, tzinfo=timezone.utc)
+    tx3 = acct.deposit(Decimal("10.00"), timestamp=t3)
+    tx1 = acct.deposit(Decimal("20.00"), timestamp=t1)
+    tx2 = acct.deposit(Decimal("30.00"), timestamp=t2)
+    res = acct.list_transactions(start_time=t2, end_time=t3)
+    assert res == [tx3, tx2]
+    # insertion order is preserved when no range is given
+    assert acct.list_transactions() == [tx3, tx1, tx2]
+
 def test_get_transaction_lookup():
     acct = accounts.Account(user_id="lookup")
     tx = acct.deposit(Decimal("15.00"))
@@ -137,15 +274,40 @@ def test_get_transaction_lookup():
     with pytest.raises(accounts.InvalidTransactionError):
         acct.get_transaction("nonexistent")
 
-def test_portfolio_and_total_equity():
-    acct = accounts.Account(user_id="portfolio")
-    acct.deposit(Decimal("5000.00"))
-    acct.buy(GOOGL, 1)  # cost 2700
-    portfolio = acct.get_portfolio_value()
+def test_portfolio_and_total_equity(funded_account):
+    funded_account.buy(GOOGL, 1)  # cost 2700
+    portfolio = funded_account.get_portfolio_value()
     assert portfolio == Decimal("2700.00")
-    total = acct.get_total_equity()
-    # cash 5000 - 2700 = 2300, equity = 2300 + 2700 = 5000
-    assert total == Decimal("5000.00")
+    total = funded_account.get_total_equity()
+    # cash 10000 - 2700 = 7300, equity = 7300 + 2700 = 10000
+    assert total == Decimal("10000.00")
+
+def test_snapshot_matches_getters():
+    acct = accounts.Account(user_id="snap", initial_deposit=Decimal("1000.00"))
+    acct.deposit(Decimal("500.00"))
+    acct.withdraw(Decimal("100.00"))
+    acct.buy(AAPL, 2)
+    snap = acct.snapshot()
+    assert snap["cash"] == acct.get_cash_balance()
+    assert snap["holdings"] == acct.get_holdings()
+    assert snap["portfolio_value"] == acct.get_portfolio_value()
+    assert snap["total_equity"] == acct.get_total_equity()
+    assert snap["pnl_initial"] == acct.get_profit_loss_from_initial()
+    assert snap["pnl_net"] == acct.get_profit_loss_from_net_deposits()
+    assert snap["transactions"] == acct.list_transactions()
+
+def test_portfolio_value_tracks_trades_and_custom_symbols():
+    acct = accounts.Account(user_id="tracked", initial_deposit=Decimal("10000.00"))
+    acct.buy(AAPL, 4)
+    acct.sell(AAPL, 1)
+    acct.buy(TSLA, 2)
+    assert acct.get_portfolio_value() == Decimal("1850.00")
+    # A symbol unknown to the default oracle can be bought with a custom price
+    acct.buy("XYZ", 1, price_lookup=lambda symbol: Decimal("10.00"))
+    with pytest.raises(accounts.InvalidTransactionError):
+        acct.get_portfolio_value()
+    acct.sell("XYZ", 1, price_lookup=lambda symbol: Decimal("10.00"))
+    assert acct.get_portfolio_value() == Decimal("1850.00")
 
 def test_profit_loss_calculations():
     acct = accounts.Account(user_id="pnl", initial_deposit=Decimal("1000.00"))
@@ -162,4 +324,11 @@ def test_profit_loss_calculations():
     # pnl_net = equity - (total_deposits - total_withdrawals)
     net_deposits = Decimal(acct.to_dict()["total_deposits"])  # string
     net_deposits = Decimal(net_deposits)
-    assert pnl_net == equity - Decimal(str(net_deposits))
\ No newline at end of file
+    assert pnl_net == equity - Decimal(str(net_deposits))
+
+def test_single_threaded_account_behaves_like_locked():
+    acct = accounts.Account(user_id="solo", initial_deposit=Decimal("1000.00"), single_threaded=True)
+    acct.buy(AAPL, 2)
+    acct.withdraw(Decimal("100.00"))
+    assert acct.get_cash_balance() == Decimal("600.00")
+    assert acct.get_total_equity() == Decimal("900.00")
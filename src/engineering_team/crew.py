@@ -1,3 +1,7 @@
+import queue
+import threading
+from typing import Callable, Iterator, Optional
+
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 
@@ -9,6 +13,11 @@ class EngineeringTeam:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
+    def __init__(self) -> None:
+        # Agents and tasks are memoized per instance, so runs on the same instance must not
+        # overlap; separate instances (e.g. one per session) run independently
+        self._run_lock = threading.Lock()
+
     @agent
     def engineering_lead(self) -> Agent:
         return Agent(
@@ -67,6 +76,51 @@ class EngineeringTeam:
             config=self.tasks_config["test_task"],
         )
 
+    def run(self, inputs: dict) -> str:
+        """Kicks off the crew with the given inputs and returns the final output"""
+        with self._run_lock:
+            return self.crew().kickoff(inputs=inputs).raw
+
+    def run_iter(self, inputs: dict) -> Iterator[str]:
+        """Kicks off the crew in a background thread and yields each task's output as it completes.
+
+        The last item is the final task's output, i.e. what run() returns.
+        """
+        outputs: queue.Queue = queue.Queue()
+
+        def kickoff() -> None:
+            try:
+                with self._run_lock:
+                    crew = self.crew()
+                    originals = [task.callback for task in crew.tasks]
+                    for task, original in zip(crew.tasks, originals):
+                        task.callback = self._forwarding_callback(outputs, original)
+                    try:
+                        crew.kickoff(inputs=inputs)
+                    finally:
+                        for task, original in zip(crew.tasks, originals):
+                            task.callback = original
+            except Exception as e:
+                outputs.put(e)
+            finally:
+                outputs.put(None)
+
+        threading.Thread(target=kickoff, daemon=True).start()
+        while (item := outputs.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            yield item.raw
+
+    @staticmethod
+    def _forwarding_callback(outputs: queue.Queue, original: Optional[Callable]) -> Callable:
+        # Queues the task output for run_iter, then runs the task's own callback, if any
+        def callback(output) -> None:
+            outputs.put(output)
+            if original is not None:
+                original(output)
+
+        return callback
+
     @crew
     def crew(self) -> Crew:
         """Creates the research crew"""
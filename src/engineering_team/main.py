@@ -27,6 +27,19 @@ module_name = "accounts.py"
 class_name = "Account"
 
 
+def simulation_inputs(companies: str, from_date: str, to_date: str) -> dict:
+    """
+    Maps the Streamlit app's parameters onto the variables the crew's tasks interpolate.
+    """
+    return {
+        "requirements": requirements
+        + f"\nThe simulation should be demonstrated with the companies {companies}"
+        + f" over the period {from_date} to {to_date}.\n",
+        "module_name": module_name,
+        "class_name": class_name,
+    }
+
+
 def run():
     """
     Run the research crew.
@@ -1,15 +1,16 @@
 import streamlit as st
 from datetime import date
 import os
-import sys
-
-# Add the project root to the Python path to allow for module imports
-# This helps in locating the 'engineering_team' module
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".")))
+import re
+import threading
+import time
 
+# 'engineering_team' is imported from the installed project (see pyproject.toml),
+# so no sys.path manipulation is needed on each rerun
 try:
     # Correctly import EngineeringTeam from your project structure
     from engineering_team.crew import EngineeringTeam
+    from engineering_team.main import simulation_inputs
 except ImportError:
     st.error(
         "Failed to import EngineeringTeam. Make sure the file structure is correct and all dependencies are installed."
@@ -17,58 +18,151 @@ except ImportError:
 
     # Add a placeholder class to prevent the app from crashing completely if the import fails
     class EngineeringTeam:
-        def __init__(self, inputs):
-            pass
-
-        def run(self):
+        def run(self, inputs):
             return "Error: Could not run the analysis due to an import failure. Please check the application logs."
 
+        def run_iter(self, inputs):
+            yield self.run(inputs)
+
+    def simulation_inputs(companies, from_date, to_date):
+        return {}
+
 
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
 
+@st.cache_resource(show_spinner=False)
+def _bootstrap() -> bool:
+    """
+    Loads environment variables once per process. Streamlit re-executes this script with
+    fresh globals on every rerun, so a module-level flag would not survive between runs.
+    """
+    load_dotenv()
+    return True
 
-def run_engineering_crew(companies, from_date, to_date):
+
+_bootstrap()
+
+
+REQUIRED_API_KEYS = ("OPENAI_API_KEY", "SERPER_API_KEY", "SEC_API_API_KEY")
+
+# Ensure API keys are set from Streamlit secrets for deployment. Streamlit re-executes
+# this script on every widget interaction, so do it once per session.
+if not st.session_state.get("_env_ready"):
+    try:
+        secrets = {key: st.secrets.get(key) for key in REQUIRED_API_KEYS}
+    except FileNotFoundError:
+        # No secrets.toml (e.g. local runs configured through .env); use the environment
+        secrets = {}
+    for key in REQUIRED_API_KEYS:
+        value = secrets.get(key) or os.environ.get(key)
+        if value:
+            os.environ[key] = value
+    st.session_state["_missing_api_keys"] = [
+        key for key in REQUIRED_API_KEYS if not os.environ.get(key)
+    ]
+    st.session_state["_env_ready"] = True
+
+
+# Exchange suffixes and numeric codes (e.g. 7203.T, 0700.HK) are part of the ticker
+_TICKER_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9.\-]*")
+
+
+@st.cache_data(show_spinner=False)
+def parse_tickers(companies: str) -> tuple[str, ...]:
     """
-    Initializes and runs the EngineeringTeam with the given parameters.
+    Normalizes free-form ticker input into a sorted, de-duplicated, upper-case tuple.
     """
-    # Ensure API keys are set from Streamlit secrets for deployment
-    os.environ["OPENAI_API_KEY"] = st.secrets.get(
-        "OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY")
-    )
-    os.environ["SERPER_API_KEY"] = st.secrets.get(
-        "SERPER_API_KEY", os.environ.get("SERPER_API_KEY")
-    )
-    os.environ["SEC_API_API_KEY"] = st.secrets.get(
-        "SEC_API_API_KEY", os.environ.get("SEC_API_API_KEY")
-    )
+    return tuple(sorted({m.group(0).upper() for m in _TICKER_RE.finditer(companies)}))
+
+
+def get_team() -> EngineeringTeam:
+    """
+    Builds the EngineeringTeam once per session and reuses it across reruns. CrewBase
+    memoizes the crew, agents and tasks per instance, so sessions must not share one.
+    Delete st.session_state["_team"] after changing API keys so the agents are rebuilt.
+    """
+    team = st.session_state.get("_team")
+    if team is None:
+        team = st.session_state["_team"] = EngineeringTeam()
+    return team
+
+
+_REPORT_TTL_SECONDS = 3600
+_REPORT_CACHE_MAX_ENTRIES = 32
+
 
+@st.cache_resource(show_spinner=False)
+def _report_cache() -> tuple[dict, threading.Lock]:
+    """
+    Process-wide store of finished reports, keyed by (tickers, from_date, to_date), and
+    the lock guarding it. Used instead of st.cache_data so a report can be streamed on its
+    first run and then served from memory on later runs with the same inputs.
+    """
+    return {}, threading.Lock()
+
+
+def _get_report(key):
+    cache, lock = _report_cache()
+    with lock:
+        cached = cache.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] >= _REPORT_TTL_SECONDS:
+            del cache[key]
+            return None
+        return cached[1]
+
+
+def _store_report(key, report) -> None:
+    cache, lock = _report_cache()
+    now = time.monotonic()
+    with lock:
+        # Purge expired entries, then drop the oldest ones to stay within the size bound
+        for stale in [k for k, (stored_at, _) in cache.items() if now - stored_at >= _REPORT_TTL_SECONDS]:
+            del cache[stale]
+        cache.pop(key, None)
+        while len(cache) >= _REPORT_CACHE_MAX_ENTRIES:
+            del cache[next(iter(cache))]
+        cache[key] = (now, report)
+
+
+def run_engineering_crew(companies, from_date, to_date):
+    """
+    Runs the EngineeringTeam with the given parameters and renders the report, showing
+    each intermediate task's output as progress while the crew runs. The report is the
+    final task's output. Returns the report.
+    """
     # Check if all required API keys are available
-    if not all(
-        [
-            os.environ.get("OPENAI_API_KEY"),
-            os.environ.get("SERPER_API_KEY"),
-            os.environ.get("SEC_API_API_KEY"),
-        ]
-    ):
+    if st.session_state["_missing_api_keys"]:
         st.error(
             "API keys are not configured. Please set OPENAI_API_KEY, SERPER_API_KEY, and SEC_API_API_KEY in your environment or Streamlit secrets."
         )
         return None
 
-    # Prepare the inputs for the crew
-    inputs = {
-        "companies": companies,
-        "from_date": from_date.strftime("%Y-%m-%d"),
-        "to_date": to_date.strftime("%Y-%m-%d"),
-    }
-
-    # Instantiate and run the crew
-    engineering_crew = EngineeringTeam(inputs)
-    result = engineering_crew.run()
-    return result
+    # Normalized tickers double as the cache key, so equivalent inputs share an entry
+    tickers = parse_tickers(companies)
+    key = (tickers, from_date.strftime("%Y-%m-%d"), to_date.strftime("%Y-%m-%d"))
+    cached = _get_report(key)
+    if cached is not None:
+        st.markdown(cached)
+        return cached
+
+    # The crew's tasks interpolate {requirements}, {module_name} and {class_name}
+    inputs = simulation_inputs(", ".join(tickers), key[1], key[2])
+    report = None
+    with st.status("Running the crew...") as status:
+        for step, output in enumerate(get_team().run_iter(inputs), start=1):
+            if report is not None:
+                # The previous output was not the last one, so it is progress, not the report
+                st.markdown(f"**Step {step - 1} finished**")
+                st.code(report)
+            report = output
+        status.update(label="Crew finished", state="complete", expanded=False)
+    if report:
+        st.markdown(report)
+        _store_report(key, report)
+    return report
 
 
 # --- Streamlit App UI ---
@@ -120,7 +214,7 @@ st.header("Analysis Report")
 
 if run_button:
     # Validate inputs before running
-    if not companies_input:
+    if not parse_tickers(companies_input):
         st.warning("Please enter at least one company ticker.")
     elif from_date_input > to_date_input:
         st.error("Error: The start date cannot be after the end date.")
@@ -134,9 +228,8 @@ if run_button:
                 )
 
                 if final_report:
+                    # The report itself was rendered while the crew ran
                     st.success("Analysis Complete!")
-                    # Display the final report
-                    st.markdown(final_report)
                 else:
                     # Handle cases where the crew execution might fail silently
                     st.error(